@@ -11,8 +11,169 @@ from tests.example_tests import (
     check_battery_status,
 )
 from onnyx.mqtt import BannerState
+import copy
 import platform
 
+# The platform cannot change while the process is running
+_IS_WINDOWS = platform.system() == "Windows"
+# Get default drive based on platform
+_DEFAULT_DRIVE = "C" if _IS_WINDOWS else "/"
+# Defaults for optional cell config keys, applied once at flow entry
+_CELL_CONFIG_DEFAULTS = {
+    "enable_intentional_fail": False,
+    "ping_url": "https://www.google.com",
+    "num_pings": 5,
+    "ping_interval": 1.0,
+    "ping_fail_fast": False,
+    "ping_mode": "http",
+    "drive_letter": None,
+    "min_write_speed_mbps": 10,
+    "num_test_files": 5,
+    "disk_test_workers": 1,
+    "enable_camera_test": True,
+    "cpu_stress_duration": 5,
+    "battery_test_enable": True,
+}
+
+
+def _drive_to_check(config: dict) -> str:
+    drive_setting = config["drive_letter"]
+
+    # If a drive letter is specified in config, respect the platform
+    if drive_setting and not _IS_WINDOWS:
+        # Convert Windows drive letter to Linux root
+        drive_setting = "/"
+
+    return drive_setting or _DEFAULT_DRIVE
+
+
+# Each step is (description, enable flag, test function, argument builder).
+# Steps with an enable flag only run when that config key is truthy.
+#
+# Steps run one at a time in table order on the flow's thread, since the
+# onnyx context they report through (banners, logging, recorded files) is not
+# known to be thread-safe. The first failing step ends the flow.
+_STEPS = [
+    (
+        "Checking system dependencies",
+        None,
+        check_system_dependencies,
+        lambda config: (
+            "Init",
+            "Check system dependencies",
+            config["enable_camera_test"],
+        ),
+    ),
+    (
+        "Checking internet connection",
+        None,
+        check_internet_connection,
+        lambda config: (
+            "Init",
+            "Check internet connection",
+            config["ping_url"],
+            config["num_pings"],
+            config["ping_interval"],
+            config["ping_fail_fast"],
+            config["ping_mode"],
+        ),
+    ),
+    (
+        "Checking if drive is present",
+        None,
+        is_drive_present,
+        lambda config: ("Init", "Check if drive is present", _drive_to_check(config)),
+    ),
+    (
+        "Checking disk speed",
+        None,
+        disk_test,
+        lambda config: (
+            "Storage Test",
+            "Save data",
+            config["min_write_speed_mbps"],
+            config["num_test_files"],
+            config["disk_test_workers"],
+        ),
+    ),
+    (
+        "Taking picture",
+        "enable_camera_test",
+        take_picture,
+        lambda config: ("Camera Test", "Take picture"),
+    ),
+    (
+        "Performing CPU stress test",
+        None,
+        cpu_stress_test,
+        lambda config: ("CPU Test", "Perform CPU stress test", config["cpu_stress_duration"]),
+    ),
+    (
+        "Getting screen resolution",
+        None,
+        get_screen_resolution,
+        lambda config: ("Display Test", "Get screen resolution"),
+    ),
+    (
+        "Checking battery status",
+        "battery_test_enable",
+        check_battery_status,
+        lambda config: ("Battery Test", "Check battery status"),
+    ),
+]
+
+
+def _enabled_steps(steps: list, config: dict) -> list:
+    """Return (description, test function, args) for the steps enabled in config."""
+    return [
+        (description, test_fn, build_args(config))
+        for description, enable_flag, test_fn, build_args in steps
+        if enable_flag is None or config[enable_flag]
+    ]
+
+
+# Sample document used when this file is run directly. Tests extend the cell
+# config in place, so always pass a deep copy to example_flow.
+_DEFAULT_TEST_DOCUMENT = {
+    "_id": "0",  # this can be anything
+    "_cell_config_obj": {
+        "battery_test_enable": False,
+        "cpu_stress_duration": 5,
+        "cpu_usage_range": {"max": 100, "min": 1},
+        "drive_letter": "C",
+        "enable_camera_test": False,
+        "min_write_speed_mbps": 50,
+        "num_test_files": 10,
+        "ping_url": "https://www.google.com",
+        "write_speed_mbps": {"max": 10000, "min": 50},
+        "enable_intentional_fail": False,
+    },
+    "_cell_settings_obj": {
+        "not_used_in_this_example": "This is not used in this example",
+    },
+}
+
+
+class _StepFailed(Exception):
+    """Raised inside example_flow to skip the remaining steps after a failure."""
+
+    def __init__(self, failure_code):
+        super().__init__(failure_code)
+        self.failure_code = failure_code
+
+
+def _log_step_result(logger, description: str, rc) -> None:
+    """Emit a single log record summarising a finished test step."""
+    failed = rc.failure_code != FailureCodes.NO_FAILURE
+    (logger.error if failed else logger.info)(
+        "step=%s status=%s failure_code=%s return_value=%s",
+        description,
+        "fail" if failed else "ok",
+        rc.failure_code,
+        rc.return_value,
+    )
+
+
 def example_flow(test_document: dict, settings: str):
     print("Starting example_flow")
     print("Test document:", test_document)
@@ -20,141 +181,46 @@ def example_flow(test_document: dict, settings: str):
 
     cellSettings = test_document["_cell_settings_obj"]
     cellConfig = test_document["_cell_config_obj"]
+    # Tests read and extend the document's config themselves, so the defaults
+    # are merged into a flow-local view rather than the document
+    config = {**_CELL_CONFIG_DEFAULTS, **cellConfig}
 
     # Use the context manager correctly
     with test_context(settings, test_document, FailureCodes.get_descriptions()) as ctx:
         ctx.logger.info("Starting example tests")
 
-        failure_code = FailureCodes.NO_FAILURE
-
-        if failure_code == FailureCodes.NO_FAILURE and cellConfig.get("enable_intentional_fail", False):
-            ctx.set_banner("Running intentional test fail...", "info", BannerState.SHOWING)
-            ctx.logger.info("Starting test: Intentional test fail")
-            failure_code = FailureCodes.INTENTIONAL_TEST_FAIL
-
-        if failure_code == FailureCodes.NO_FAILURE:
-            ctx.logger.info("Starting test: Checking system dependencies")
-            rc = check_system_dependencies("Init", "Check system dependencies")
-            if rc.failure_code != FailureCodes.NO_FAILURE:
-                ctx.logger.error("Missing required dependencies")
-                failure_code = rc.failure_code
-            else:
-                ctx.record_values(rc.return_value)
-            ctx.logger.info("Test completed: %s", rc.return_value)
-
-        if failure_code == FailureCodes.NO_FAILURE:
-            ctx.logger.info("Starting test: Checking internet connection")
-            rc = check_internet_connection(
-                "Init",
-                "Check internet connection",
-                cellConfig.get("ping_url", "https://www.google.com"),
-                cellConfig.get("num_pings", 5),
-                cellConfig.get("ping_interval", 1.0),
-            )
-            ctx.logger.info(rc.__dict__)
-            if rc.failure_code != FailureCodes.NO_FAILURE:
-                ctx.logger.info("Test failed with failure code: %s", rc.failure_code)
-                failure_code = rc.failure_code
-            else:
-                ctx.record_values(rc.return_value)
-            ctx.logger.info("Test completed: %s", rc.return_value)
-
-        if failure_code == FailureCodes.NO_FAILURE:
-            ctx.logger.info("Starting test: Checking if drive is present")
-            # Get default drive based on platform
-            default_drive = "C" if platform.system() == "Windows" else "/"
-            drive_setting = cellConfig.get("drive_letter")
-
-            # If a drive letter is specified in config, respect the platform
-            if drive_setting and platform.system() != "Windows":
-                # Convert Windows drive letter to Linux root
-                drive_setting = "/"
-
-            rc = is_drive_present(
-                "Init",
-                "Check if drive is present",
-                drive_setting or default_drive,
-            )
-            if rc.failure_code != FailureCodes.NO_FAILURE:
-                failure_code = rc.failure_code
-            ctx.record_values(rc.return_value)
-            ctx.logger.info("Test completed: %s", rc.return_value)
-
-        if failure_code == FailureCodes.NO_FAILURE:
-            ctx.logger.info("Starting test: Checking disk speed")
-            min_mbps = cellConfig.get("min_write_speed_mbps", 10)
-            num_test_files = cellConfig.get("num_test_files", 5)
-            rc = disk_test("Storage Test", "Save data", min_mbps, num_test_files)
-            if rc.failure_code != FailureCodes.NO_FAILURE:
-                failure_code = rc.failure_code
-            else:
-                ctx.record_values(rc.return_value)
-            ctx.logger.info("Test completed: %s Failure code: %s", rc.return_value, rc.failure_code)
-
-        if failure_code == FailureCodes.NO_FAILURE and cellConfig.get(
-            "enable_camera_test", True
-        ):
-            ctx.logger.info("Starting test: Taking picture")
-            rc = take_picture("Camera Test", "Take picture")
-            if rc.failure_code != FailureCodes.NO_FAILURE:
-                failure_code = rc.failure_code
-            else:
-                ctx.record_values(rc.return_value)
-            ctx.logger.info("Test completed: %s Failure code: %s", rc.return_value, rc.failure_code)
-
-        if failure_code == FailureCodes.NO_FAILURE:
-            ctx.logger.info("Starting test: Performing CPU stress test")
-            rc = cpu_stress_test(
-                "CPU Test",
-                "Perform CPU stress test",
-                cellConfig.get("cpu_stress_duration", 5),
-            )
-            if rc.failure_code != FailureCodes.NO_FAILURE:
-                failure_code = rc.failure_code
-            else:
-                ctx.record_values(rc.return_value)
-            ctx.logger.info("Test completed: %s Failure code: %s", rc.return_value, rc.failure_code)
-
-        if failure_code == FailureCodes.NO_FAILURE:
-            ctx.logger.info("Starting test: Getting screen resolution")
-            rc = get_screen_resolution("Display Test", "Get screen resolution")
-            if rc.failure_code != FailureCodes.NO_FAILURE:
-                failure_code = rc.failure_code
-            else:
-                ctx.record_values(rc.return_value)
-            ctx.logger.info("Test completed: %s Failure code: %s", rc.return_value, rc.failure_code)
-
-        if failure_code == FailureCodes.NO_FAILURE and cellConfig.get(
-            "battery_test_enable", True
-        ):
-            ctx.logger.info("Starting test: Checking battery status")
-            rc = check_battery_status("Battery Test", "Check battery status")
-            if rc.failure_code != FailureCodes.NO_FAILURE:
-                failure_code = rc.failure_code
-            else:
-                ctx.record_values(rc.return_value)
-            ctx.logger.info("Test completed: %s", rc.return_value)
+        NO_FAILURE = FailureCodes.NO_FAILURE
+        # Values from every step are collected here and recorded in one call
+        # before wrap up instead of one record_values round trip per step
+        recorded_values = {}
+
+        def finish_step(description: str, rc) -> None:
+            _log_step_result(ctx.logger, description, rc)
+            # Record measurements even if the step failed
+            if rc.return_value:
+                recorded_values.update(rc.return_value)
+            if rc.failure_code != NO_FAILURE:
+                raise _StepFailed(rc.failure_code)
+
+        try:
+            if config["enable_intentional_fail"]:
+                ctx.set_banner("Running intentional test fail...", "info", BannerState.SHOWING)
+                ctx.logger.info("step=Intentional test fail status=fail")
+                raise _StepFailed(FailureCodes.INTENTIONAL_TEST_FAIL)
+
+            for description, test_fn, args in _enabled_steps(_STEPS, config):
+                finish_step(description, test_fn(*args))
+
+            failure_code = NO_FAILURE
+        except _StepFailed as e:
+            failure_code = e.failure_code
+        finally:
+            # Record what was measured even if a test raised unexpectedly
+            if recorded_values:
+                ctx.record_values(recorded_values)
 
         ctx.wrap_up(failure_code)
 
 
 if __name__ == "__main__":
-    test_document = {
-        "_id": "0",  # this can be anything
-        "_cell_config_obj": {
-            "battery_test_enable": False,
-            "cpu_stress_duration": 5,
-            "cpu_usage_range": {"max": 100, "min": 1},
-            "drive_letter": "C",
-            "enable_camera_test": False,
-            "min_write_speed_mbps": 50,
-            "num_test_files": 10,
-            "ping_url": "https://www.google.com",
-            "write_speed_mbps": {"max": 10000, "min": 50},
-            "enable_intentional_fail": False,
-        },
-        "_cell_settings_obj": {
-            "not_used_in_this_example": "This is not used in this example",
-        },
-    }
-    example_flow(test_document, "DEV")
+    example_flow(copy.deepcopy(_DEFAULT_TEST_DOCUMENT), "DEV")
@@ -1,4 +1,9 @@
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+import errno
+import mmap
+import multiprocessing
 import os
 import time
 from onnyx.failure import FailureCode, BaseFailureCodes
@@ -8,15 +13,43 @@ from onnyx.context import gcc, ButtonResponse
 from onnyx.mqtt import BannerState
 from onnyx.utils import range_check_list, range_check
 import subprocess
-import cv2
-import numpy as np
+import importlib
+import importlib.metadata
 import ctypes
+import socket
 import psutil
 import csv
 from datetime import datetime
-from typing import List
+from urllib.parse import urlparse
+from typing import List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import lru_cache
 import platform
+import re
 from shutil import which
+import atexit
+import threading
+
+# Host facts that cannot change while the process is running, looked up once
+# instead of on every test call
+_IS_WINDOWS = platform.system() == "Windows"
+_CPU_COUNT = psutil.cpu_count() or 1
+# Upper bound in seconds on any helper process, so a hung X server or
+# PowerShell host cannot wedge a test
+SUBPROCESS_TIMEOUT = 5
+
+
+def _cell_config_with_defaults(context, defaults: dict) -> dict:
+    """Return the document's cell config with missing ``defaults`` filled in.
+
+    Defaults are written into the config so range checks and later tests see
+    the same values.
+    """
+    cell_config = context.document.get("_cell_config_obj", {})
+    for key, default_range in defaults.items():
+        cell_config.setdefault(key, default_range)
+    return cell_config
 
 
 class FailureCodes(FailureCode):
@@ -37,6 +70,194 @@ class FailureCodes(FailureCode):
     CPU_PERFORMANCE_FAILED = (-10, "CPU performance below requirements")
     INPUT_TIMEOUT = (-11, "Input request timed out")
     INTENTIONAL_TEST_FAIL = (-12, "Intentionally failed test")
+    CONFIGURATION_ERROR = (-13, "Invalid configuration")
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def get_descriptions(cls):
+        # The codes are fixed once the class is created, so build the
+        # description mapping once per process instead of once per flow run
+        return super().get_descriptions()
+
+# Upper bound on pings in flight at once so large num_pings values do not
+# exhaust worker threads or sockets
+MAX_CONCURRENT_PINGS = 8
+
+# Shared across pings (and test runs) so connections are kept alive and reused
+# instead of paying a TCP and TLS handshake for every ping
+_HTTP_SESSION = requests.Session()
+# Keep one pooled connection per concurrent ping
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_PINGS)
+_HTTP_SESSION.mount("http://", _HTTP_ADAPTER)
+_HTTP_SESSION.mount("https://", _HTTP_ADAPTER)
+
+
+# Status codes from servers that do not answer HEAD requests
+_HEAD_NOT_SUPPORTED = frozenset({405, 501})
+
+
+def _http_ping(url: str) -> requests.Response:
+    """Request ``url`` without downloading the response body.
+
+    HEAD only needs the status line and headers, so no body is downloaded just
+    to prove the host is reachable. Servers that reject HEAD are sent a
+    streamed GET instead, which is closed before the body is read.
+    """
+    response = _HTTP_SESSION.head(url, timeout=5, allow_redirects=False)
+    if response.status_code in _HEAD_NOT_SUPPORTED:
+        response = _HTTP_SESSION.get(
+            url, timeout=5, allow_redirects=False, stream=True
+        )
+        response.close()
+    return response
+
+
+# Supported values for check_internet_connection's ``mode``
+PING_MODES = ("http", "tcp")
+# Ports used for TCP pings when the URL does not name one
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _ping_url_error(url: str) -> Optional[str]:
+    """Return why ``url`` cannot be pinged, or None if it is usable.
+
+    Without a scheme urlparse finds no hostname, and getaddrinfo(None, ...)
+    would then resolve to the loopback address.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in _DEFAULT_PORTS or not parsed.hostname:
+        return f"expected an http:// or https:// URL with a hostname, got {url!r}"
+    try:
+        parsed.port
+    except ValueError as e:
+        return f"invalid port in {url!r}: {e}"
+    return None
+
+
+def _tcp_ping(url: str) -> float:
+    """Time a TCP connect to the host in ``url`` and return it in ms.
+
+    The host is resolved before the timer starts and only the connect to the
+    first resolved address is timed, so neither the DNS lookup nor retries
+    against other addresses are counted, and no TLS or HTTP round trips are.
+    """
+    parsed = urlparse(url)
+    port = parsed.port or _DEFAULT_PORTS.get(parsed.scheme, 443)
+    family, sock_type, proto, _, address = socket.getaddrinfo(
+        parsed.hostname, port, type=socket.SOCK_STREAM
+    )[0]
+    with socket.socket(family, sock_type, proto) as sock:
+        sock.settimeout(5)
+        start = time.perf_counter()
+        sock.connect(address)
+        return (time.perf_counter() - start) * 1000
+
+
+async def _ping_once(
+    url: str,
+    semaphore: asyncio.Semaphore,
+    executor: ThreadPoolExecutor,
+    delay: float = 0.0,
+    mode: str = "http",
+) -> dict:
+    """Send a single ping to ``url`` after waiting ``delay`` seconds.
+
+    The blocking request runs on ``executor`` so that several pings can be
+    in flight at the same time. ``mode`` is "http" for a HEAD request or
+    "tcp" for a bare TCP connect.
+
+    Returns:
+        dict: Ping result row with timestamp (epoch seconds), url,
+        ping_time_ms and status.
+    """
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+    loop = asyncio.get_running_loop()
+    async with semaphore:
+        try:
+            if mode == "tcp":
+                ping_time_ms = await loop.run_in_executor(executor, _tcp_ping, url)
+            else:
+                response = await loop.run_in_executor(executor, _http_ping, url)
+                # elapsed runs from sending the request to parsing the
+                # response headers, so thread hand-off and event loop
+                # scheduling are not counted as network time
+                ping_time_ms = response.elapsed.total_seconds() * 1000
+
+            return {
+                "timestamp": time.time(),
+                "url": url,
+                "ping_time_ms": round(ping_time_ms, 2),
+                "status": "success",
+            }
+        except (requests.ConnectionError, OSError, UnicodeError):
+            return {
+                "timestamp": time.time(),
+                "url": url,
+                "ping_time_ms": None,
+                "status": "failed",
+            }
+
+
+async def _ping_all(
+    url: str,
+    num_pings: int,
+    interval: float,
+    fail_fast: bool = False,
+    mode: str = "http",
+) -> List[dict]:
+    """Fire ``num_pings`` pings concurrently, staggered by ``interval`` seconds.
+
+    With ``fail_fast`` the remaining pings are cancelled as soon as one
+    succeeds. Pings already waiting on the network cannot be interrupted, so
+    their worker threads are left to finish in the background rather than
+    being waited for.
+
+    Returns:
+        List[dict]: Ping result rows in the order the pings were issued, or in
+        completion order up to the first success with ``fail_fast``.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PINGS)
+    # A dedicated executor rather than asyncio's default one, which
+    # asyncio.run waits for on shutdown even after the pings are cancelled
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PINGS)
+    pings = [
+        asyncio.ensure_future(
+            _ping_once(url, semaphore, executor, i * interval, mode)
+        )
+        for i in range(num_pings)
+    ]
+    if not fail_fast:
+        try:
+            return await asyncio.gather(*pings)
+        finally:
+            executor.shutdown(wait=False)
+
+    ping_results = []
+    try:
+        for next_ping in asyncio.as_completed(pings):
+            ping_result = await next_ping
+            ping_results.append(ping_result)
+            if ping_result["status"] == "success":
+                break
+    finally:
+        for ping in pings:
+            ping.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+    return ping_results
+
+
+def _hostname_resolves(url: str) -> bool:
+    """Return whether the host in ``url`` has a DNS answer."""
+    try:
+        socket.getaddrinfo(urlparse(url).hostname, None)
+    except (socket.gaierror, UnicodeError):
+        # UnicodeError: the name cannot be IDNA encoded, e.g. a label over
+        # 63 characters
+        return False
+    return True
+
 
 @test()
 def check_internet_connection(
@@ -45,15 +266,32 @@ def check_internet_connection(
     url: str = "https://www.google.com",
     num_pings: int = 5,
     interval: float = 1.0,
+    fail_fast: bool = False,
+    mode: str = "http",
 ):
     """Check if there's an active internet connection and log ping times.
 
+    Pings are issued concurrently; ``interval`` staggers their start times
+    instead of sleeping between sequential requests.
+
+    With ``fail_fast`` the test acts as a quick health probe: the hostname is
+    resolved once up front, the test fails straight away if it does not
+    resolve, and it passes as soon as any ping succeeds. Pings still waiting
+    on the network at that point finish in the background. As without
+    ``fail_fast``, ``num_pings=0`` passes once the hostname resolves.
+
+    In "tcp" mode each ping only times a TCP connect to the host, which
+    measures network latency without the TLS and HTTP round trips.
+
     Args:
         category (str, optional): Test category. Used internally by the test framework.
         test_name (str, optional): Test name. Used internally by the test framework.
         url (str): The URL to test the connection against. Defaults to "https://www.google.com".
         num_pings (int): Number of pings to perform. Defaults to 5.
-        interval (float): Time between pings in seconds. Defaults to 1.0.
+        interval (float): Time between ping start times in seconds. Defaults to 1.0.
+        fail_fast (bool): Stop at the first successful ping. Defaults to False.
+        mode (str): "http" for HEAD request pings or "tcp" for TCP connect
+            pings. Defaults to "http".
 
     Returns:
         TestResult: Test result with possible outcomes:
@@ -67,65 +305,83 @@ def check_internet_connection(
             - Failure (INTERNET_CONNECTION_FAILED):
                 "Internet connection failed"
                 return_value: {
-                    "ping_results": List of ping results up to failure
+                    "ping_results": List of ping results
                 }
-                Condition: Connection error during ping attempts
+                Condition: Connection error during any ping attempt, or with
+                fail_fast, the hostname does not resolve or no ping succeeds
+
+            - Failure (CONFIGURATION_ERROR):
+                "Unsupported ping mode: {mode}" or "Invalid ping URL: {reason}"
+                Condition: ``mode`` is not one of PING_MODES, or ``url`` is
+                not an http(s) URL with a hostname and a valid port
     """
     context = gcc()  # Get current context
-    ping_results = []
     csv_path = "ping_results.csv"
 
+    if mode not in PING_MODES:
+        context.logger.error(
+            f"Unsupported ping mode {mode!r}, expected one of {PING_MODES}"
+        )
+        return TestResult(
+            f"Unsupported ping mode: {mode}",
+            FailureCodes.CONFIGURATION_ERROR,
+        )
+    url_error = _ping_url_error(url)
+    if url_error:
+        context.logger.error(f"Invalid ping URL: {url_error}")
+        return TestResult(
+            f"Invalid ping URL: {url_error}",
+            FailureCodes.CONFIGURATION_ERROR,
+        )
+
     # Only update banner at start and end of test
     context.set_banner("Running internet connection test...", "info", BannerState.SHOWING)
 
+    host_unresolved = fail_fast and not _hostname_resolves(url)
+    if host_unresolved:
+        # Every ping would fail, so do not wait for their timeouts
+        context.logger.error(f"Could not resolve host for {url}")
+        ping_results = []
+    else:
+        ping_results = asyncio.run(
+            _ping_all(url, num_pings, interval, fail_fast, mode)
+        )
+    # Timestamps are formatted once all pings are done rather than while
+    # requests are in flight
+    for ping_result in ping_results:
+        ping_result["timestamp"] = datetime.fromtimestamp(
+            ping_result["timestamp"]
+        ).isoformat()
+
     # Create/open CSV file with headers if it doesn't exist
     file_exists = os.path.isfile(csv_path)
     with open(csv_path, "a", newline="") as csvfile:
         fieldnames = ["timestamp", "url", "ping_time_ms", "status"]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.writer(csvfile)
 
         if not file_exists:
-            writer.writeheader()
-
-        for i in range(num_pings):
-            try:
-                start_time = time.time()
-                response = requests.get(url, timeout=5)
-                end_time = time.time()
-                ping_time_ms = (end_time - start_time) * 1000  # Convert to milliseconds
-                status = "success"
-
-                result = {
-                    "timestamp": datetime.now().isoformat(),
-                    "url": url,
-                    "ping_time_ms": round(ping_time_ms, 2),
-                    "status": status,
-                }
-
-                writer.writerow(result)
-                ping_results.append(result)
+            writer.writerow(fieldnames)
 
-                if interval > 0 and i < num_pings - 1:  # Don't sleep after last ping
-                    time.sleep(interval)
+        writer.writerows(
+            [ping_result[field] for field in fieldnames]
+            for ping_result in ping_results
+        )
 
-            except requests.ConnectionError:
-                context.set_banner(
-                    "Internet connection failed!", "error", BannerState.SHOWING
-                )
-                result = {
-                    "timestamp": datetime.now().isoformat(),
-                    "url": url,
-                    "ping_time_ms": None,
-                    "status": "failed",
-                }
-                writer.writerow(result)
-                ping_results.append(result)
+    if fail_fast:
+        connection_failed = host_unresolved or (
+            bool(ping_results)
+            and all(p["status"] == "failed" for p in ping_results)
+        )
+    else:
+        connection_failed = any(p["status"] == "failed" for p in ping_results)
 
-                return TestResult(
-                    "Internet connection failed",
-                    FailureCodes.INTERNET_CONNECTION_FAILED,
-                    return_value={"ping_results": ping_results},
-                )
+    if connection_failed:
+        context.set_banner("Internet connection failed!", "error", BannerState.SHOWING)
+        return TestResult(
+            "Internet connection failed",
+            FailureCodes.INTERNET_CONNECTION_FAILED,
+            return_value={"ping_results": ping_results},
+        )
 
     # Save the csv file for uploading to Onnyx
     context.record_file(csv_path)
@@ -182,20 +438,25 @@ def is_drive_present(
                 }
     """
     try:
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             # Use "C" as default for Windows
             drive_letter = drive_letter or "C"
             # Strip any path separators and take first character
             drive_letter = drive_letter.replace("/", "").replace("\\", "")[0].upper()
 
-            ps_command = "Get-PSDrive -PSProvider 'FileSystem' | Select-Object -ExpandProperty Name"
-            result = subprocess.run(
-                ["powershell", "-Command", ps_command],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            drives_present = result.stdout.strip().split("\n")
+            # A single kernel32 call returns a bitmask of the assigned drive
+            # letters without querying each volume
+            drive_mask = ctypes.windll.kernel32.GetLogicalDrives()
+            if drive_mask:
+                drives_present = [
+                    chr(ord("A") + i) for i in range(26) if drive_mask & (1 << i)
+                ]
+            else:
+                # Mount points are drive roots such as C:\, keep just the letter
+                drives_present = [
+                    partition.mountpoint[0]
+                    for partition in psutil.disk_partitions(all=False)
+                ]
 
             if drive_letter in drives_present:
                 return TestResult(
@@ -213,13 +474,15 @@ def is_drive_present(
             ):
                 mount_point = "/"
 
-            result = subprocess.run(
-                ["df", "-h"], capture_output=True, text=True, check=True
-            )
-            mounts = result.stdout.strip().split("\n")[1:]  # Skip header
-            drives_present = [line.split()[-1] for line in mounts]
+            # all=True keeps "nodev" filesystems such as overlay, tmpfs, NFS
+            # and FUSE mounts, which df lists and which may hold the root of
+            # a container or live image
+            drives_present = [
+                partition.mountpoint
+                for partition in psutil.disk_partitions(all=True)
+            ]
 
-            if os.path.exists(mount_point) and mount_point in drives_present:
+            if os.path.ismount(mount_point):
                 return TestResult(
                     f"Mount point {mount_point} is present",
                     return_value={"drives_present": drives_present},
@@ -228,7 +491,7 @@ def is_drive_present(
         # If we get here, the drive/mount point wasn't found
         path_name = (
             "Drive " + drive_letter
-            if platform.system() == "Windows"
+            if _IS_WINDOWS
             else "Mount point " + mount_point
         )
         return TestResult(
@@ -237,7 +500,7 @@ def is_drive_present(
             return_value={"drives_present": drives_present},
         )
 
-    except subprocess.CalledProcessError as e:
+    except OSError as e:
         return TestResult(
             f"Error checking drive presence: {e}",
             FailureCodes.EXCEPTION,
@@ -245,12 +508,110 @@ def is_drive_present(
         )
 
 
+# Direct I/O bypasses the page cache so disk_test measures the device rather
+# than memory bandwidth. Not available on Windows or macOS.
+_O_DIRECT = getattr(os, "O_DIRECT", 0)
+# O_DIRECT needs block-aligned buffers, offsets and lengths; 1 MiB satisfies
+# every common block size
+_WRITE_CHUNK_SIZE = 1024 * 1024
+
+
+@lru_cache(maxsize=1)
+def _disk_test_payload(num_chunks: int) -> mmap.mmap:
+    """Return ``num_chunks`` blocks of random data for the disk test files.
+
+    Every ``_WRITE_CHUNK_SIZE`` block in a file is distinct, so filesystems
+    and SSD controllers that compress or deduplicate blocks cannot shrink
+    the write and inflate the measured speed. All test files share this
+    payload, which storage that deduplicates across files could still
+    detect. The random data is generated once per process, outside the timed
+    writes. It lives in an anonymous mmap because that memory is page
+    aligned, as O_DIRECT requires.
+    """
+    payload = mmap.mmap(-1, num_chunks * _WRITE_CHUNK_SIZE)
+    for offset in range(0, len(payload), _WRITE_CHUNK_SIZE):
+        payload[offset : offset + _WRITE_CHUNK_SIZE] = os.urandom(_WRITE_CHUNK_SIZE)
+    return payload
+
+
+def _write_payload(file_path: str, payload, direct: bool) -> None:
+    """Write ``payload`` to ``file_path`` one chunk at a time and fsync it."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    if direct:
+        flags |= _O_DIRECT
+
+    fd = os.open(file_path, flags, 0o644)
+    try:
+        view = memoryview(payload)
+        for offset in range(0, len(view), _WRITE_CHUNK_SIZE):
+            remaining = view[offset : offset + _WRITE_CHUNK_SIZE]
+            while remaining:
+                remaining = remaining[os.write(fd, remaining) :]
+        # Force flush to disk
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_test_file(
+    file_path: str, payload, logger
+) -> Tuple[float, float, int]:
+    """Write ``payload`` to ``file_path``, force it to disk and remove the
+    file again.
+
+    Kept at module level so disk_test can hand it to an executor.
+
+    Args:
+        file_path (str): Path of the test file to write.
+        payload: Page aligned data to write (see _disk_test_payload).
+        logger: Logger used to report cleanup errors.
+
+    Returns:
+        Tuple[float, float, int]: perf_counter start and end time of the write
+        and the size of the file on disk in bytes.
+    """
+    try:
+        # Ensure we start with a clean file
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
+
+        # Get high precision time
+        start_time = time.perf_counter()
+
+        try:
+            _write_payload(file_path, payload, direct=True)
+        except OSError as e:
+            if e.errno != errno.EINVAL:
+                raise
+            # The filesystem does not support direct I/O (e.g. tmpfs), so
+            # repeat the write through the page cache
+            start_time = time.perf_counter()
+            _write_payload(file_path, payload, direct=False)
+
+        end_time = time.perf_counter()
+
+        # Verify file was written correctly
+        return start_time, end_time, os.path.getsize(file_path)
+
+    finally:
+        # Clean up test file
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error cleaning up file {file_path}: {e}")
+
+
 @test()
 def disk_test(
     category: str = None,
     test_name: str = None,
     min_mbps: float = 10.0,
     num_files: int = 5,
+    max_workers: int = 1,
 ):
     """Save test files and measure write performance.
 
@@ -259,6 +620,9 @@ def disk_test(
         test_name (str, optional): Test name. Used internally by the test framework.
         min_mbps (float): Minimum required write speed in MB/s.
         num_files (int): Number of files to write. Defaults to 5.
+        max_workers (int): Number of files written at the same time. Values
+            above 1 keep more writes in flight on the device, but each file
+            then only sees its share of the bandwidth. Defaults to 1.
 
     Returns:
         TestResult: Test result with possible outcomes:
@@ -266,14 +630,18 @@ def disk_test(
                 "Data saved successfully. Average write speed: {avg_speed:.2f} MB/s"
                 return_value: {
                     "disk_test_results": List of per-file test results,
-                    "write_speeds": List of write speeds in MB/s
+                    "write_speeds": List of write speeds in MB/s,
+                    "aggregate_write_speed_mbps": Combined MB/s of all files
+                        over the wall time of the writes
                 }
 
             - Failure (WRITE_SPEED_BELOW_MIN):
                 "Write speed out of range: {message}"
                 return_value: {
                     "disk_test_results": List of per-file test results,
-                    "write_speeds": List of write speeds in MB/s
+                    "write_speeds": List of write speeds in MB/s,
+                    "aggregate_write_speed_mbps": Combined MB/s of all files
+                        over the wall time of the writes
                 }
                 Condition: Write speeds outside configured range
 
@@ -283,15 +651,11 @@ def disk_test(
     """
     try:
         context = gcc()
-        cellConfig = context.document.get("_cell_config_obj", {})
-        context.set_banner("Running disk test...", "info", BannerState.SHOWING)
-
         # Use write_speed_mbps from cellConfig if available, otherwise create default range
-        if not "write_speed_mbps" in cellConfig:
-            cellConfig["write_speed_mbps"] = {
-                "min": min_mbps,
-                "max": 10000.0,
-            }  # Up to 10GB/s
+        cellConfig = _cell_config_with_defaults(
+            context, {"write_speed_mbps": {"min": min_mbps, "max": 10000.0}}  # Up to 10GB/s
+        )
+        context.set_banner("Running disk test...", "info", BannerState.SHOWING)
 
         results = []
         write_speeds = []
@@ -299,94 +663,100 @@ def disk_test(
 
         # Increase test file size to 100MB for more accurate measurements
         TEST_FILE_SIZE_MB = 100
-        data = os.urandom(1024 * 1024 * TEST_FILE_SIZE_MB)  # Create test data once
+        payload = _disk_test_payload(
+            TEST_FILE_SIZE_MB * 1024 * 1024 // _WRITE_CHUNK_SIZE
+        )
+        expected_size = len(payload)
+
+        file_paths = [f"disk_test_file_{i+1}.dat" for i in range(num_files)]
+        # Writes and fsync release the GIL, so threads are enough to overlap them
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            timings = list(
+                executor.map(
+                    lambda path: _write_test_file(path, payload, context.logger),
+                    file_paths,
+                )
+            )
 
-        with open(csv_path, "w", newline="") as csvfile:
-            csvwriter = csv.writer(csvfile)
-            csvwriter.writerow(
+        csv_rows = [
+            [
+                "File",
+                "Write Time (s)",
+                "Write Speed (MB/s)",
+                "File Size (MB)",
+                "Start Time",
+                "End Time",
+            ]
+        ]
+        for i, (file_path, (start_time, end_time, actual_size)) in enumerate(
+            zip(file_paths, timings)
+        ):
+            write_time = end_time - start_time
+            actual_size_mb = actual_size / (1024 * 1024)
+
+            if actual_size != expected_size:
+                context.logger.error(
+                    f"File size mismatch! Expected {TEST_FILE_SIZE_MB}MB, got {actual_size_mb:.2f}MB"
+                )
+                write_speed_mbps = 0
+            elif write_time <= 0:
+                context.logger.error(f"Invalid write time: {write_time}s")
+                write_speed_mbps = 0
+            else:
+                write_speed_mbps = TEST_FILE_SIZE_MB / write_time
+
+            # Log detailed timing info
+            context.logger.info(
+                f"File {i+1}: Size={actual_size_mb:.2f}MB, "
+                f"Time={write_time:.4f}s, Speed={write_speed_mbps:.2f}MB/s"
+            )
+
+            csv_rows.append(
                 [
-                    "File",
-                    "Write Time (s)",
-                    "Write Speed (MB/s)",
-                    "File Size (MB)",
-                    "Start Time",
-                    "End Time",
+                    file_path,
+                    f"{write_time:.4f}",
+                    f"{write_speed_mbps:.2f}",
+                    f"{actual_size_mb:.2f}",
+                    start_time,
+                    end_time,
                 ]
             )
 
-            for i in range(num_files):
-                file_path = f"disk_test_file_{i+1}.dat"
-
-                try:
-                    # Ensure we start with a clean file
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-
-                    # Get high precision time
-                    start_time = time.perf_counter()
-
-                    with open(file_path, "wb") as f:
-                        f.write(data)
-                        # Force flush to disk
-                        f.flush()
-                        os.fsync(f.fileno())
-
-                    end_time = time.perf_counter()
-                    write_time = end_time - start_time
-
-                    # Verify file was written correctly
-                    actual_size = os.path.getsize(file_path)
-                    actual_size_mb = actual_size / (1024 * 1024)
-
-                    if actual_size != len(data):
-                        context.logger.error(
-                            f"File size mismatch! Expected {TEST_FILE_SIZE_MB}MB, got {actual_size_mb:.2f}MB"
-                        )
-                        write_speed_mbps = 0
-                    elif write_time <= 0:
-                        context.logger.error(f"Invalid write time: {write_time}s")
-                        write_speed_mbps = 0
-                    else:
-                        write_speed_mbps = TEST_FILE_SIZE_MB / write_time
-
-                    # Log detailed timing info
-                    context.logger.info(
-                        f"File {i+1}: Size={actual_size_mb:.2f}MB, "
-                        f"Time={write_time:.4f}s, Speed={write_speed_mbps:.2f}MB/s"
-                    )
-
-                    csvwriter.writerow(
-                        [
-                            file_path,
-                            f"{write_time:.4f}",
-                            f"{write_speed_mbps:.2f}",
-                            f"{actual_size_mb:.2f}",
-                            start_time,
-                            end_time,
-                        ]
-                    )
+            results.append(
+                {
+                    "file": file_path,
+                    "write_time_seconds": write_time,
+                    "write_speed_mbps": write_speed_mbps,
+                    "file_size_mb": actual_size_mb,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                }
+            )
 
-                    results.append(
-                        {
-                            "file": file_path,
-                            "write_time_seconds": write_time,
-                            "write_speed_mbps": write_speed_mbps,
-                            "file_size_mb": actual_size_mb,
-                            "start_time": start_time,
-                            "end_time": end_time,
-                        }
-                    )
+            if write_speed_mbps > 0:  # Only include non-zero speeds
+                write_speeds.append(write_speed_mbps)
 
-                    if write_speed_mbps > 0:  # Only include non-zero speeds
-                        write_speeds.append(write_speed_mbps)
+        # Write the whole report at once after the timed writes are done
+        with open(csv_path, "w", newline="") as csvfile:
+            csv.writer(csvfile).writerows(csv_rows)
+
+        # With several workers the writes overlap and each file only sees its
+        # share of the bandwidth, so also report the throughput of all writes
+        # together over the wall time they spanned
+        aggregate_write_speed_mbps = 0
+        if timings:
+            wall_time = max(end for _, end, _ in timings) - min(
+                start for start, _, _ in timings
+            )
+            if wall_time > 0:
+                total_mb = sum(size for _, _, size in timings) / (1024 * 1024)
+                aggregate_write_speed_mbps = total_mb / wall_time
 
-                finally:
-                    # Clean up test file
-                    try:
-                        if os.path.exists(file_path):
-                            os.remove(file_path)
-                    except Exception as e:
-                        context.logger.error(f"Error cleaning up file {file_path}: {e}")
+        return_value = {
+            "disk_test_results": results,
+            "write_speeds": write_speeds,
+            "aggregate_write_speed_mbps": aggregate_write_speed_mbps,
+        }
 
         # Save the csv file for uploading to Onnyx
         try:
@@ -399,10 +769,7 @@ def disk_test(
             return TestResult(
                 "All write speed measurements were 0 MB/s. Check disk permissions and space.",
                 FailureCodes.ERROR_SAVING_DATA,
-                return_value={
-                    "disk_test_results": results,
-                    "write_speeds": write_speeds,
-                },
+                return_value=return_value,
             )
 
         # Check write speeds against range using write_speed_mbps config
@@ -414,20 +781,14 @@ def disk_test(
             return TestResult(
                 f"Write speed out of range: {rc.message}",
                 FailureCodes.WRITE_SPEED_BELOW_MIN,
-                return_value={
-                    "disk_test_results": results,
-                    "write_speeds": write_speeds,
-                },
+                return_value=return_value,
             )
 
         avg_speed = sum(write_speeds) / len(write_speeds)
         return TestResult(
             f"Data saved successfully. Average write speed: {avg_speed:.2f} MB/s",
             FailureCodes.NO_FAILURE,
-            return_value={
-                "disk_test_results": results,
-                "write_speeds": write_speeds,
-            },
+            return_value=return_value,
         )
     except Exception as e:
         return TestResult(
@@ -436,10 +797,79 @@ def disk_test(
         )
 
 
+# Resolution requested from the camera; the metrics do not need more detail
+CAMERA_FRAME_WIDTH = 640
+CAMERA_FRAME_HEIGHT = 480
+
+
+# Opening a camera enumerates the device and negotiates the stream, which
+# costs far more than reading a frame. With the keep_camera_open cell config
+# key set, captures stay open between take_picture runs and are released at
+# exit; by default each run releases the camera so its LED turns off and
+# other applications can use it. The lock gives one caller at a time the
+# capture.
+_captures = {}
+_captures_lock = threading.Lock()
+
+
+def _release_captures() -> None:
+    with _captures_lock:
+        for cap in _captures.values():
+            cap.release()
+        _captures.clear()
+
+
+atexit.register(_release_captures)
+
+
+@contextmanager
+def _opened_capture(cv2, index: int, keep_open: bool = False):
+    """Yield the capture for camera ``index``, opening it if needed.
+
+    ``cv2`` is passed in because OpenCV is only imported once take_picture
+    runs. The capture is yielded even if it failed to open; callers check
+    ``isOpened()``. With ``keep_open`` a working capture is kept for the next
+    call; otherwise, and for captures that failed to open or raised while in
+    use, it is released so the next call opens the device again.
+    """
+    with _captures_lock:
+        cap = _captures.pop(index, None)
+        if cap is None:
+            # Open the native backend directly instead of letting OpenCV
+            # probe every backend it was built with
+            cap = cv2.VideoCapture(
+                index, cv2.CAP_DSHOW if _IS_WINDOWS else cv2.CAP_V4L2
+            )
+            if cap.isOpened():
+                # Ask for compressed VGA frames so each capture moves a
+                # fraction of the data of raw full resolution frames over
+                # USB, and keep only the most recent frame buffered
+                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_FRAME_WIDTH)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_FRAME_HEIGHT)
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        try:
+            yield cap
+        except BaseException:
+            cap.release()
+            raise
+
+        if keep_open and cap.isOpened():
+            _captures[index] = cap
+        else:
+            cap.release()
+
+
 @test()
 def take_picture(category: str = None, test_name: str = None):
     """Take a picture using the laptop's camera and analyze image properties.
 
+    The camera is asked for MJPG frames at CAMERA_FRAME_WIDTH x
+    CAMERA_FRAME_HEIGHT; cameras that do not support this return their
+    default format instead. The camera is released after each run unless
+    the keep_camera_open cell config key is set.
+
     Args:
         category (str, optional): Test category. Used internally by the test framework.
         test_name (str, optional): Test name. Used internally by the test framework.
@@ -451,35 +881,81 @@ def take_picture(category: str = None, test_name: str = None):
                 return_value: {
                     "camera_metrics": {
                         "image_shape": Image dimensions tuple,
-                        "avg_color": Average RGB color values,
-                        "contrast": Image contrast value,
-                        "brightness": Image brightness value,
-                        "saturation": Image saturation value
+                        "avg_color": Average BGR color values,
+                        "contrast": Standard deviation of all pixel values,
+                        "brightness": Mean of all pixel values,
+                        "saturation": Mean HSV saturation (0-255)
+                        (color metrics are sampled from every 4th pixel
+                        in each direction)
                     }
                 }
 
             - Failure (CAMERA_NOT_AVAILABLE):
                 "Failed to open camera"
-                Condition: Camera device cannot be opened
+                Condition: Camera device cannot be opened, or on Linux
+                /dev/video0 does not exist
+
+            - Failure (MISSING_DEPENDENCIES):
+                "Missing required dependencies: {error}"
+                Condition: OpenCV or NumPy cannot be imported, for example
+                because a system library OpenCV links against is missing
 
             - Failure (IMAGE_CAPTURE_FAILED):
-                "Failed to capture image"
-                Condition: Camera opened but image capture failed
+                "Failed to capture image" or "Failed to capture image: {error}"
+                Condition: Camera opened but image capture failed, or OpenCV
+                raised an error while capturing
 
             - Failure (EXCEPTION):
                 "Error capturing image: {error}"
                 Condition: Other exceptions during capture
     """
     try:
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
+        # Without a video device node there is nothing to open, so skip
+        # loading OpenCV and waking the capture driver
+        if not _IS_WINDOWS and not os.path.exists("/dev/video0"):
             return TestResult(
                 "Failed to open camera",
                 FailureCodes.CAMERA_NOT_AVAILABLE,
             )
 
-        ret, frame = cap.read()
-        cap.release()
+        # OpenCV and NumPy are only needed here, so they are imported on first
+        # use rather than by every flow that imports this module. Flows that
+        # skip check_system_dependencies' OpenCV import still get a
+        # MISSING_DEPENDENCIES result here instead of an EXCEPTION.
+        try:
+            import cv2
+            import numpy as np
+        except ImportError as e:
+            return TestResult(
+                f"Missing required dependencies: {e}",
+                FailureCodes.MISSING_DEPENDENCIES,
+            )
+
+        keep_open = gcc().document.get("_cell_config_obj", {}).get(
+            "keep_camera_open", False
+        )
+        try:
+            with _opened_capture(cv2, 0, keep_open) as cap:
+                if not cap.isOpened():
+                    return TestResult(
+                        "Failed to open camera",
+                        FailureCodes.CAMERA_NOT_AVAILABLE,
+                    )
+
+                # Many cameras return a stale or black first frame, and a kept
+                # open capture still holds a frame from its last use; grab()
+                # skips it without decoding
+                cap.grab()
+                ret, frame = cap.read()
+                if not ret:
+                    # The device may have been unplugged or reset; drop the
+                    # kept open capture so the next run opens it again
+                    cap.release()
+        except cv2.error as e:
+            return TestResult(
+                f"Failed to capture image: {e}",
+                FailureCodes.IMAGE_CAPTURE_FAILED,
+            )
 
         if not ret:
             return TestResult(
@@ -491,14 +967,25 @@ def take_picture(category: str = None, test_name: str = None):
         # cv2.imwrite("captured_image.png", frame)
 
         # instead lets do some analysis on the image and generate some metrics
+        # from every 4th pixel in each direction; summary statistics do not
+        # need the full frame, and the strided view reads 1/16 of the data
+        sample = frame[::4, ::4]
+        # per-channel mean and standard deviation in a single SIMD pass
+        channel_mean, channel_std = cv2.meanStdDev(sample)
         # calculate the average color of the image
-        avg_color = np.mean(frame, axis=(0, 1))
-        # calculate the contrast of the image
-        contrast = np.std(frame)
-        # calculate the brightness of the image
-        brightness = np.mean(frame)
-        # calculate the saturation of the image
-        saturation = np.std(frame)
+        avg_color = channel_mean.ravel()
+        # calculate the brightness of the image (every channel has the same
+        # number of pixels, so this is the mean over all values)
+        brightness = float(avg_color.mean())
+        # calculate the contrast of the image: the standard deviation over all
+        # values, recombined from the per-channel moments
+        contrast = float(
+            np.sqrt(
+                max(np.mean(channel_std.ravel() ** 2 + avg_color**2) - brightness**2, 0.0)
+            )
+        )
+        # calculate the saturation of the image from the HSV S channel
+        saturation = float(cv2.cvtColor(sample, cv2.COLOR_BGR2HSV)[..., 1].mean())
 
         # return TestResult(
         #     "Image captured successfully",
@@ -526,12 +1013,41 @@ def take_picture(category: str = None, test_name: str = None):
         )
 
 
+def _cpu_burn(duration_seconds: float) -> int:
+    """Run CPU-intensive calculations for ``duration_seconds``.
+
+    Kept at module level so it can be pickled into a ProcessPoolExecutor worker.
+
+    Returns:
+        int: Number of operations completed.
+    """
+    import numpy as np
+
+    # One operation is the same arithmetic as summing i * i for i in range(100)
+    # 10000 times, done as matrix-vector products over a cache resident block
+    # so the time goes to the ALUs rather than the interpreter. Integer dot
+    # products do not use BLAS, so each worker stays on a single core.
+    values = np.arange(100, dtype=np.int64)
+    block = np.tile(values, (100, 1))
+
+    # The clock is read once per operation (100 products), so its cost is
+    # negligible; monotonic keeps clock adjustments from stretching the run
+    end_time = time.monotonic() + duration_seconds
+    operations_count = 0
+    while time.monotonic() < end_time:
+        for _ in range(100):
+            block.dot(values)
+        operations_count += 1
+    return operations_count
+
+
 @test()
 def cpu_stress_test(
     category: str = None, test_name: str = None, duration_seconds: int = 5
 ):
     """Perform a CPU stress test for a specified duration.
-    Uses a computationally intensive single-threaded operation to stress test the CPU.
+    Runs a computationally intensive operation in one worker process per
+    logical core so that every core is loaded, not just the one holding the GIL.
 
     Args:
         category (str, optional): Test category. Used internally by the test framework.
@@ -544,7 +1060,7 @@ def cpu_stress_test(
                 "CPU stress test completed successfully"
                 return_value: {
                     "duration_seconds": Actual test duration,
-                    "operations_completed": Number of operations performed,
+                    "operations_completed": Number of operations performed across all workers,
                     "initial_cpu_percent": Initial CPU usage percentage,
                     "final_cpu_percent": Final CPU usage percentage,
                     "cpu_cores": Number of CPU cores,
@@ -563,12 +1079,10 @@ def cpu_stress_test(
     """
     try:
         context = gcc()
-        start_time = time.time()
-        end_time = start_time + duration_seconds
-        operations_count = 0
-        last_banner_update = start_time
+        start_time = time.perf_counter()
         BANNER_UPDATE_INTERVAL = 0.5  # Update banner every 0.5 seconds
         cpu_percentages = []  # List to store CPU percentages for range check
+        num_workers = _CPU_COUNT
 
         # Get initial CPU usage
         initial_cpu_percent = psutil.cpu_percent(interval=0.1)
@@ -578,17 +1092,31 @@ def cpu_stress_test(
             BannerState.SHOWING,
         )
 
-        # Run CPU-intensive calculations
-        while time.time() < end_time:
-            # Matrix operations and other CPU-intensive calculations
-            for _ in range(10000):
-                _ = sum(i * i for i in range(100))
-            operations_count += 1
-
-            # Update banner less frequently
-            current_time = time.time()
-            if current_time - last_banner_update >= BANNER_UPDATE_INTERVAL:
-                elapsed = current_time - start_time
+        # Run CPU-intensive calculations on every core, sampling CPU usage
+        # and updating the banner from this process while the workers run.
+        # A single core gains nothing from a worker process, so skip the
+        # process start-up and burn on a thread instead.
+        if num_workers > 1:
+            # Workers are spawned rather than forked: this process may have
+            # live threads (e.g. pings left running by fail_fast), and a
+            # forked child can deadlock on a lock one of them held
+            executor = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=1)
+        with executor:
+            futures = [
+                executor.submit(_cpu_burn, duration_seconds)
+                for _ in range(num_workers)
+            ]
+            while True:
+                _, pending = wait(futures, timeout=BANNER_UPDATE_INTERVAL)
+                if not pending:
+                    break
+
+                elapsed = time.perf_counter() - start_time
                 remaining = max(0, duration_seconds - elapsed)
                 current_cpu = psutil.cpu_percent(interval=0)
                 cpu_percentages.append(current_cpu)  # Store CPU percentage
@@ -597,13 +1125,16 @@ def cpu_stress_test(
                     "warning" if current_cpu > 80 else "info",
                     BannerState.SHOWING,
                 )
-                last_banner_update = current_time
 
-        actual_duration = time.time() - start_time
+            operations_count = sum(future.result() for future in futures)
+
+        actual_duration = time.perf_counter() - start_time
 
         # Get final CPU usage
         final_cpu_percent = psutil.cpu_percent(interval=0.1)
         cpu_percentages.append(final_cpu_percent)
+        # Read once; the current frequency is still sampled on every run
+        cpu_freq = psutil.cpu_freq()
 
         # Check CPU usage range
         cellConfig = context.document.get("_cell_config_obj", {})
@@ -620,8 +1151,8 @@ def cpu_stress_test(
             "operations_completed": operations_count,
             "initial_cpu_percent": initial_cpu_percent,
             "final_cpu_percent": final_cpu_percent,
-            "cpu_cores": psutil.cpu_count(),
-            "cpu_freq": psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None,
+            "cpu_cores": _CPU_COUNT,
+            "cpu_freq": cpu_freq._asdict() if cpu_freq else None,
             "cpu_percentages": cpu_percentages,
         }
 
@@ -648,6 +1179,65 @@ def cpu_stress_test(
         )
 
 
+def _x11_screen_size() -> Optional[Tuple[int, int]]:
+    """Return the X screen size using python-xlib, or None if unavailable.
+
+    Opening the display is a single round trip to the X server, with no
+    process to spawn or output to parse. A new connection is made on every
+    call because the screen size is only reported when connecting. On
+    multi-monitor setups the X screen spans all monitors.
+    """
+    try:
+        from Xlib import display, error
+    except ImportError:
+        return None
+
+    try:
+        x_display = display.Display()
+    except error.DisplayError:
+        return None
+
+    try:
+        screen = x_display.screen()
+        return screen.width_in_pixels, screen.height_in_pixels
+    finally:
+        x_display.close()
+
+
+# Current mode line, e.g. "   1920x1080     60.00*+  59.93"
+_XRANDR_CURRENT_MODE_RE = re.compile(rb"^[ \t]+(\d+)x(\d+)\S*[ \t][^\n]*\*", re.M)
+# Geometry of a connected output, e.g. "DP-1 connected primary 1920x1080+0+0".
+# Disconnected outputs can keep a stale geometry, so they are not matched.
+_XRANDR_GEOMETRY_RE = re.compile(
+    rb"^\S+ connected [^\n]*?(\d+)x(\d+)\+\d+\+\d+", re.M
+)
+
+
+def _xrandr_screen_size() -> Tuple[int, int]:
+    """Return the current resolution parsed from ``xrandr``, or (0, 0)."""
+    try:
+        # --current reports the configuration already known to the X server
+        # instead of re-probing the outputs
+        output = subprocess.check_output(
+            ["xrandr", "--current"], timeout=SUBPROCESS_TIMEOUT
+        )
+    except (
+        subprocess.CalledProcessError,
+        subprocess.TimeoutExpired,
+        FileNotFoundError,
+    ):
+        # Fallback for systems without X11
+        return 0, 0
+
+    # The output is searched as bytes in a single regex pass, so it never
+    # needs decoding or splitting into lines
+    # The starred current mode is preferred, as it is not swapped by rotation
+    match = _XRANDR_CURRENT_MODE_RE.search(output) or _XRANDR_GEOMETRY_RE.search(output)
+    if match is None:
+        return 0, 0
+    return int(match[1]), int(match[2])
+
+
 @test()
 def get_screen_resolution(category: str = None, test_name: str = None):
     """Get the current screen resolution.
@@ -663,51 +1253,27 @@ def get_screen_resolution(category: str = None, test_name: str = None):
     """
     try:
         context = gcc()
-        cellConfig = context.document.get("_cell_config_obj", {})
-
         # Set default ranges if not in config
-        if not "min_resolution_width" in cellConfig:
-            cellConfig["min_resolution_width"] = {"min": 1024, "max": 100000}
-        if not "min_resolution_height" in cellConfig:
-            cellConfig["min_resolution_height"] = {"min": 768, "max": 100000}
+        cellConfig = _cell_config_with_defaults(
+            context,
+            {
+                "min_resolution_width": {"min": 1024, "max": 100000},
+                "min_resolution_height": {"min": 768, "max": 100000},
+            },
+        )
 
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             user32 = ctypes.windll.user32
             width = user32.GetSystemMetrics(0)
             height = user32.GetSystemMetrics(1)
+        elif "DISPLAY" not in os.environ:
+            # Without a display there is no X server for python-xlib or
+            # xrandr to query, so skip the import and the subprocess
+            width, height = 0, 0
         else:
-            # Linux implementation using xrandr
-            try:
-                # Get xrandr output and find current resolution (marked with *)
-                output = subprocess.check_output(["xrandr"], text=True)
-                
-                # Look for lines with asterisk (current resolution)
-                for line in output.split('\n'):
-                    if '*' in line:
-                        # Extract resolution (format: "   1920x1080     60.00*+  59.93")
-                        parts = line.strip().split()
-                        if parts and 'x' in parts[0]:
-                            width, height = map(int, parts[0].split('x'))
-                            break
-                else:
-                    # If no asterisk found, try connected displays
-                    for line in output.split('\n'):
-                        if ' connected' in line and 'x' in line:
-                            # Parse line like "DP-1 connected primary 1920x1080+0+0"
-                            parts = line.split()
-                            for part in parts:
-                                if 'x' in part and '+' in part:
-                                    resolution = part.split('+')[0]
-                                    width, height = map(int, resolution.split('x'))
-                                    break
-                            else:
-                                continue
-                            break
-                    else:
-                        width = height = 0
-            except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
-                # Fallback for systems without X11 or parsing errors
-                width = height = 0
+            # Ask the X server directly, falling back to xrandr when
+            # python-xlib is not installed or no display can be opened
+            width, height = _x11_screen_size() or _xrandr_screen_size()
 
         # Check width and height against minimum requirements
         rc_width = range_check(
@@ -753,6 +1319,91 @@ def get_screen_resolution(category: str = None, test_name: str = None):
         )
 
 
+# Default for the battery_cache_seconds cell config key: how long a
+# psutil.sensors_battery() reading is reused, since the query goes through
+# ACPI or WMI and can be slow
+BATTERY_CACHE_SECONDS = 2.0
+# [monotonic time of the last reading, the reading]
+_battery_cache = [0.0, None]
+
+
+def _sensors_battery(max_age: float):
+    """Return psutil.sensors_battery(), reusing a reading up to ``max_age`` seconds old."""
+    read_at, battery = _battery_cache
+    now = time.monotonic()
+    if battery is None or now - read_at >= max_age:
+        battery = psutil.sensors_battery()
+        _battery_cache[:] = [now, battery]
+    return battery
+
+
+# Read directly by check_battery_status on Linux
+_BATTERY_SYSFS_PATH = "/sys/class/power_supply/BAT0"
+# BAT0 status values that mean external power is connected
+_SYSFS_PLUGGED_STATUSES = ("Charging", "Full", "Not charging")
+
+
+@lru_cache(maxsize=1)
+def _battery_fds() -> Tuple[int, int]:
+    """Open the BAT0 capacity and status attributes once per process.
+
+    sysfs regenerates an attribute's contents on every read from offset 0, so
+    the descriptors are re-read with os.pread instead of being reopened.
+    """
+    capacity_fd = os.open(f"{_BATTERY_SYSFS_PATH}/capacity", os.O_RDONLY)
+    try:
+        status_fd = os.open(f"{_BATTERY_SYSFS_PATH}/status", os.O_RDONLY)
+    except OSError:
+        os.close(capacity_fd)
+        raise
+    return capacity_fd, status_fd
+
+
+def _read_sysfs_battery() -> Tuple[int, str]:
+    """Return the BAT0 charge percentage and status string."""
+    capacity_fd, status_fd = _battery_fds()
+    try:
+        percent = int(os.pread(capacity_fd, 16, 0))
+        status = os.pread(status_fd, 32, 0).decode().strip()
+    except OSError:
+        # The battery was removed; drop the stale descriptors so the next
+        # call reopens them
+        _battery_fds.cache_clear()
+        os.close(capacity_fd)
+        os.close(status_fd)
+        raise
+    return percent, status
+
+
+def _read_sysfs_int(name: str) -> Optional[int]:
+    """Return the integer BAT0 attribute ``name``, or None if it is missing."""
+    try:
+        with open(f"{_BATTERY_SYSFS_PATH}/{name}", "rb") as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _sysfs_seconds_left(power_plugged: bool) -> int:
+    """Estimate BAT0's remaining run time the same way psutil does.
+
+    Batteries report either energy (µWh) and power (µW), or charge (µAh)
+    and current (µA); either ratio gives the hours left. The attributes are
+    only read while discharging.
+    """
+    if power_plugged:
+        return psutil.POWER_TIME_UNLIMITED
+    for now_name, rate_name in (
+        ("energy_now", "power_now"),
+        ("charge_now", "current_now"),
+    ):
+        remaining = _read_sysfs_int(now_name)
+        rate = _read_sysfs_int(rate_name)
+        if remaining is not None and rate:
+            return int(remaining / rate * 3600)
+    return psutil.POWER_TIME_UNKNOWN
+
+
 @test()
 def check_battery_status(category: str = None, test_name: str = None):
     """Check the laptop's battery status.
@@ -768,91 +1419,66 @@ def check_battery_status(category: str = None, test_name: str = None):
     """
     try:
         context = gcc()
-        cellConfig = context.document.get("_cell_config_obj", {})
-
         # Set default ranges if not in config
-        if not "battery_percentage_range" in cellConfig:
-            cellConfig["battery_percentage_range"] = {"min": 10.0, "max": 100.0}
-        if not "battery_voltage_range" in cellConfig:
-            cellConfig["battery_voltage_range"] = {
-                "min": 10.8,
-                "max": 12.6,
-            }  # Typical laptop battery range
+        cellConfig = _cell_config_with_defaults(
+            context,
+            {
+                "battery_percentage_range": {"min": 10.0, "max": 100.0},
+                # Typical laptop battery range
+                "battery_voltage_range": {"min": 10.8, "max": 12.6},
+            },
+        )
 
-        battery = psutil.sensors_battery()
-        if battery is None:
-            # Try Linux-specific method if psutil fails
-            if platform.system() != "Windows":
-                try:
-                    # Check if battery exists
-                    battery_path = "/sys/class/power_supply/BAT0"
-                    if os.path.exists(battery_path):
-                        with open(f"{battery_path}/capacity", "r") as f:
-                            percent = int(f.read().strip())
-                        with open(f"{battery_path}/status", "r") as f:
-                            status = f.read().strip()
-                        power_plugged = status == "Charging"
-
-                        # Check battery percentage range
-                        rc = range_check(
-                            percent,
-                            "battery_percentage_range",
-                            cellConfig,
-                            prefix="battery",
-                        )
-
-                        if rc.failure_code != BaseFailureCodes.NO_FAILURE:
-                            return TestResult(
-                                f"Battery percentage out of range: {rc.message}",
-                                FailureCodes.EXCEPTION,
-                                return_value={
-                                    "battery_percent": percent,
-                                    "power_plugged": power_plugged,
-                                    "seconds_left": -1,
-                                },
-                            )
-
-                        return TestResult(
-                            f"Battery at {percent}%, {'plugged in' if power_plugged else 'not plugged in'}",
-                            FailureCodes.NO_FAILURE,
-                            return_value={
-                                "battery_percent": percent,
-                                "power_plugged": power_plugged,
-                                "seconds_left": -1,
-                            },
-                        )
-                except Exception:
-                    pass
+        reading = None
+        if not _IS_WINDOWS:
+            # BAT0's capacity and status are all this test needs, while psutil
+            # walks every power supply in sysfs to build its reading
+            try:
+                percent, status = _read_sysfs_battery()
+                power_plugged = status in _SYSFS_PLUGGED_STATUSES
+                reading = (
+                    percent,
+                    power_plugged,
+                    _sysfs_seconds_left(power_plugged),
+                )
+            except (OSError, ValueError):
+                # No usable BAT0; let psutil look for another battery
+                pass
 
-            return TestResult(
-                "No battery detected",
-                FailureCodes.NO_BATTERY,
+        if reading is None:
+            battery = _sensors_battery(
+                cellConfig.get("battery_cache_seconds", BATTERY_CACHE_SECONDS)
             )
+            if battery is None:
+                return TestResult(
+                    "No battery detected",
+                    FailureCodes.NO_BATTERY,
+                )
+            reading = (battery.percent, battery.power_plugged, battery.secsleft)
+
+        percent, power_plugged, seconds_left = reading
+        return_value = {
+            "battery_percent": percent,
+            "power_plugged": power_plugged,
+            "seconds_left": seconds_left,
+        }
 
         # Check battery percentage range
         rc = range_check(
-            battery.percent, "battery_percentage_range", cellConfig, prefix="battery"
+            percent, "battery_percentage_range", cellConfig, prefix="battery"
         )
 
         if rc.failure_code != BaseFailureCodes.NO_FAILURE:
             return TestResult(
                 f"Battery percentage out of range: {rc.message}",
                 FailureCodes.EXCEPTION,
-                return_value={
-                    "battery_percent": battery.percent,
-                    "power_plugged": battery.power_plugged,
-                    "seconds_left": battery.secsleft,
-                },
+                return_value=return_value,
             )
 
         return TestResult(
-            f"Battery at {battery.percent}%, {'plugged in' if battery.power_plugged else 'not plugged in'}",
+            f"Battery at {percent}%, {'plugged in' if power_plugged else 'not plugged in'}",
             FailureCodes.NO_FAILURE,
-            return_value={
-                "battery_percent": battery.percent,
-                "power_plugged": battery.power_plugged,
-                "seconds_left": battery.secsleft,
-            },
+            return_value=return_value,
         )
     except Exception as e:
         return TestResult(
@@ -861,15 +1487,155 @@ def check_battery_status(category: str = None, test_name: str = None):
         )
 
 
+# Registry keys written by the Windows PowerShell 3+ and 1/2 installers
+_POWERSHELL_ENGINE_KEYS = (
+    r"SOFTWARE\Microsoft\PowerShell\3\PowerShellEngine",
+    r"SOFTWARE\Microsoft\PowerShell\1\PowerShellEngine",
+)
+
+
+def _powershell_version() -> str:
+    """Return the installed Windows PowerShell version.
+
+    The version is read from the registry rather than by starting PowerShell,
+    which takes hundreds of milliseconds. PowerShell is only run if neither
+    engine key is present.
+    """
+    import winreg
+
+    for key_path in _POWERSHELL_ENGINE_KEYS:
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
+                return winreg.QueryValueEx(key, "PowerShellVersion")[0]
+        except OSError:
+            continue
+
+    # Skip loading user profiles, which can take longer than the query itself
+    return subprocess.run(
+        [
+            "powershell",
+            "-NoProfile",
+            "-NonInteractive",
+            "-Command",
+            "$PSVersionTable.PSVersion.ToString()",
+        ],
+        capture_output=True,
+        timeout=SUBPROCESS_TIMEOUT,
+    ).stdout.strip().decode()
+
+
+def _require_executable(name: str) -> str:
+    """Return the path of ``name`` on PATH, or raise FileNotFoundError.
+
+    Presence is all the dependency check needs, so the executable is looked
+    up rather than run.
+    """
+    path = which(name)
+    if path is None:
+        raise FileNotFoundError(f"{name} not found on PATH")
+    return path
+
+
+# Distributions that can provide the cv2 module
+_OPENCV_DISTRIBUTIONS = (
+    "opencv-python",
+    "opencv-python-headless",
+    "opencv-contrib-python",
+    "opencv-contrib-python-headless",
+)
+
+
+@lru_cache(maxsize=1)
+def _opencv_version() -> str:
+    """Return the installed OpenCV version.
+
+    The version is read from package metadata so the dependency check does
+    not have to load the OpenCV extension. Builds installed without
+    metadata are imported instead. A found version is kept for the life of
+    the process; a missing OpenCV is looked up again on the next call.
+
+    Installed metadata does not prove that cv2 can be imported: on headless
+    Linux the extension may still fail to load, e.g. without libGL.so.1.
+    check_system_dependencies imports cv2 as well when the camera test will
+    run (see ``check_opencv_import``).
+    """
+    for distribution in _OPENCV_DISTRIBUTIONS:
+        try:
+            return importlib.metadata.version(distribution)
+        except importlib.metadata.PackageNotFoundError:
+            continue
+    return importlib.import_module("cv2").__version__
+
+
+# Installed dependencies do not change between back-to-back runs, so a
+# passing check_system_dependencies result is reused for this many seconds
+DEPENDENCY_CACHE_TTL = 60.0
+# [monotonic time of the last passing check, its dependencies dict]
+_dependency_cache = [0.0, None]
+
+
+# Dependency checks for check_system_dependencies, built once at import, as
+# (dependency name, probe, exceptions meaning the dependency is missing).
+# Other exceptions also mark the dependency as missing, reported with their
+# type so unexpected failures stand out.
+# Each probe returns the status fields reported for an installed dependency:
+# its version, or "Available" and the executable's path for tools that only
+# need to be present.
+_SUBPROCESS_PROBE_ERRORS = (
+    subprocess.CalledProcessError,
+    subprocess.TimeoutExpired,
+    FileNotFoundError,
+)
+_DEPENDENCY_PROBES = [
+    (
+        "python-opencv",
+        lambda: {"version": _opencv_version()},
+        (ImportError, AttributeError),
+    ),
+    ("psutil", lambda: {"version": psutil.__version__}, (AttributeError,)),
+]
+
+# Platform specific dependencies
+if _IS_WINDOWS:
+    _DEPENDENCY_PROBES += [
+        (
+            "powershell",
+            lambda: {"version": _powershell_version()},
+            _SUBPROCESS_PROBE_ERRORS,
+        ),
+    ]
+else:  # Linux
+    _DEPENDENCY_PROBES += [
+        (
+            "xrandr",
+            lambda: {"version": "Available", "path": _require_executable("xrandr")},
+            _SUBPROCESS_PROBE_ERRORS,
+        ),
+        (
+            "df",
+            lambda: {"version": "Available", "path": _require_executable("df")},
+            _SUBPROCESS_PROBE_ERRORS,
+        ),
+    ]
+
+
 @test()
-def check_system_dependencies(category: str = None, test_name: str = None):
+def check_system_dependencies(
+    category: str = None, test_name: str = None, check_opencv_import: bool = False
+):
     """Check if all required system dependencies are installed.
 
     Verifies presence of required system tools and libraries for both Windows and Linux.
+    A passing result is reused for DEPENDENCY_CACHE_TTL seconds.
+
+    The OpenCV probe only reads package metadata. With ``check_opencv_import``
+    cv2 is also imported, so an OpenCV that is installed but cannot load is
+    reported here rather than by the camera test.
 
     Args:
         category (str, optional): Test category. Used internally by the test framework.
         test_name (str, optional): Test name. Used internally by the test framework.
+        check_opencv_import (bool): Also import cv2. Defaults to False.
 
     Returns:
         TestResult: Test result with possible outcomes:
@@ -889,52 +1655,53 @@ def check_system_dependencies(category: str = None, test_name: str = None):
     dependencies = {}
     missing = []
 
-    # Common dependencies
-    common_deps = {
-        "python-opencv": lambda: cv2.__version__,
-        "psutil": lambda: psutil.__version__,
-    }
-
-    # Platform specific dependencies
-    if platform.system() == "Windows":
-        platform_deps = {
-            "powershell": lambda: subprocess.run(
-                ["powershell", "-Command", "$PSVersionTable.PSVersion.ToString()"],
-                capture_output=True,
-                text=True,
-            ).stdout.strip(),
-        }
-    else:  # Linux
-        platform_deps = {
-            "xrandr": lambda: subprocess.run(
-                ["xrandr", "--version"], capture_output=True, text=True
-            ).stdout.split("\n")[0],
-            "df": lambda: which("df") is not None,
-        }
-
-    # Check common dependencies
-    for dep_name, check_func in common_deps.items():
-        try:
-            result = check_func()
-            dependencies[dep_name] = {
-                "installed": True,
-                "version": str(result) if result is not True else "Available",
+    # Reuse a recent passing result; failures are always re-checked so a
+    # fixed installation is picked up on the next run
+    cached_at, cached_dependencies = _dependency_cache
+    from_cache = (
+        cached_dependencies is not None
+        and time.monotonic() - cached_at < DEPENDENCY_CACHE_TTL
+    )
+    if from_cache:
+        for dep_name, status in cached_dependencies.items():
+            dependencies[dep_name] = dict(status)
+    else:
+        # The probes are independent and mostly wait on imports or
+        # subprocesses, so run them all at once; results are still collected
+        # in table order
+        with ThreadPoolExecutor(max_workers=len(_DEPENDENCY_PROBES)) as executor:
+            futures = {
+                dep_name: executor.submit(probe)
+                for dep_name, probe, _ in _DEPENDENCY_PROBES
             }
-        except Exception as e:
-            dependencies[dep_name] = {"installed": False, "error": str(e)}
-            missing.append(dep_name)
 
-    # Check platform specific dependencies
-    for dep_name, check_func in platform_deps.items():
+        for dep_name, _, missing_errors in _DEPENDENCY_PROBES:
+            try:
+                dependencies[dep_name] = {
+                    "installed": True,
+                    **futures[dep_name].result(),
+                }
+            except missing_errors as e:
+                dependencies[dep_name] = {"installed": False, "error": str(e)}
+                missing.append(dep_name)
+            except Exception as e:
+                # Any other failure, e.g. a broken native module or a probe
+                # that is not allowed to run, still means the dependency is
+                # unusable; name the error type since it was not expected
+                dependencies[dep_name] = {
+                    "installed": False,
+                    "error": f"{type(e).__name__}: {e}",
+                }
+                missing.append(dep_name)
+
+    if check_opencv_import and dependencies["python-opencv"]["installed"]:
+        # Once loaded, cv2 stays in sys.modules, so repeat checks are free
         try:
-            result = check_func()
-            dependencies[dep_name] = {
-                "installed": True,
-                "version": str(result) if result is not True else "Available",
-            }
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            dependencies[dep_name] = {"installed": False, "error": str(e)}
-            missing.append(dep_name)
+            importlib.import_module("cv2")
+        except Exception as e:
+            error = str(e) if isinstance(e, ImportError) else f"{type(e).__name__}: {e}"
+            dependencies["python-opencv"] = {"installed": False, "error": error}
+            missing.append("python-opencv")
 
     if missing:
         return TestResult(
@@ -943,6 +1710,12 @@ def check_system_dependencies(category: str = None, test_name: str = None):
             return_value={"dependencies": dependencies, "missing": missing},
         )
 
+    if not from_cache:
+        _dependency_cache[:] = [
+            time.monotonic(),
+            {dep_name: dict(status) for dep_name, status in dependencies.items()},
+        ]
+
     return TestResult(
         "All required dependencies are installed",
         return_value={"dependencies": dependencies},